@@ -6,6 +6,7 @@ import sys
 from typing import Optional
 
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QSurfaceFormat
 from PySide6.QtWidgets import QApplication
 
 from .main_window import MainWindow
@@ -19,6 +20,11 @@ def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser.add_argument("--bg", type=str, default=None, help="Background color hex, e.g. #ffffff")
     parser.add_argument("--fg", type=str, default=None, help="Foreground color hex, e.g. #1b1f23")
     parser.add_argument("--show-all-levels", action="store_true", help="Line mode: show all levels")
+    parser.add_argument(
+        "--no-opengl",
+        action="store_true",
+        help="Render with the CPU raster engine instead of OpenGL",
+    )
     return parser.parse_args(argv)
 
 
@@ -36,11 +42,18 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     logging.basicConfig(level=logging.INFO)
 
+    if not args.no_opengl:
+        # Must be set before the application creates any GL context
+        fmt = QSurfaceFormat()
+        fmt.setSamples(4)
+        fmt.setSwapInterval(1)
+        QSurfaceFormat.setDefaultFormat(fmt)
+
     app = QApplication(sys.argv[:1])
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
 
-    win = MainWindow()
+    win = MainWindow(use_opengl=not args.no_opengl)
     # Apply CLI options onto the UI
     win.panels.mode_combo.setCurrentText("Line" if args.mode == "line" else "Dust")
     win.panels.depth_spin.setValue(int(args.depth))
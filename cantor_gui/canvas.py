@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import math
 from typing import List
 
 from PySide6.QtCore import QPoint, QPointF, Qt
-from PySide6.QtGui import QColor, QMouseEvent, QWheelEvent, QPainter
-from PySide6.QtWidgets import QGraphicsPathItem, QGraphicsScene, QGraphicsView
+from PySide6.QtGui import QColor, QMouseEvent, QPainter, QTransform, QWheelEvent
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsItemGroup, QGraphicsScene, QGraphicsView
+
+
+# Zoom factor per wheel angle unit is 1.0015; kept as a log so factor = exp(angle * k)
+_ZOOM_LOG_STEP = math.log(1.0015)
 
 
 class Canvas(QGraphicsView):
@@ -13,30 +19,63 @@ class Canvas(QGraphicsView):
     - Mouse wheel zoom centered on cursor
     - Middle-drag or space+drag to pan
     - Ctrl+0 to reset zoom
+
+    With `use_opengl` the view paints into a QOpenGLWidget so path filling is
+    done on the GPU; an OpenGL viewport always uses FullViewportUpdate.
     """
 
-    def __init__(self, parent=None) -> None:
+    def __init__(self, parent=None, use_opengl: bool = True) -> None:
         super().__init__(parent)
+        self._use_opengl = use_opengl
+        if use_opengl:
+            self.setViewport(QOpenGLWidget())
         self.setRenderHints(
             self.renderHints()
             | QPainter.RenderHint.Antialiasing
             | QPainter.RenderHint.TextAntialiasing
         )
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate)
+        if use_opengl:
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        else:
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate)
         self.setDragMode(QGraphicsView.DragMode.NoDrag)
+        # Zoom and pan compose their own transforms; Qt must not re-anchor them
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.NoAnchor)
         self._panning = False
         self._last_mouse_pos = QPoint()
         self._space_pressed = False
         self._scene = QGraphicsScene(self)
+        # The scene is only panned and zoomed, never hit-tested, so skip the BSP index
+        self._scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         self.setScene(self._scene)
 
-    def set_scene_items(self, path_items: List[QGraphicsPathItem], bg: QColor) -> None:
+    def set_scene_items(self, path_items: List[QGraphicsItem], bg: QColor) -> None:
         self._scene.clear()
         self._scene.setBackgroundBrush(bg)
+        # Add everything under one group so the scene tracks a single top-level node
+        group = QGraphicsItemGroup()
         for item in path_items:
-            self._scene.addItem(item)
+            group.addToGroup(item)
+        self._scene.addItem(group)
         self.fit_to_scene()
 
+    def set_background(self, bg: QColor) -> None:
+        self._scene.setBackgroundBrush(bg)
+
+    def set_update_mode(self, dense: bool) -> None:
+        """Repaint the whole viewport for dense scenes.
+
+        With thousands of tiny shapes, computing dirty bounding rects costs more
+        than simply redrawing everything.
+        """
+        mode = (
+            QGraphicsView.ViewportUpdateMode.FullViewportUpdate
+            if dense or self._use_opengl
+            else QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate
+        )
+        if self.viewportUpdateMode() != mode:
+            self.setViewportUpdateMode(mode)
+
     def fit_to_scene(self) -> None:
         rect = self._scene.itemsBoundingRect()
         if rect.isNull():
@@ -55,13 +94,15 @@ class Canvas(QGraphicsView):
         angle = event.angleDelta().y()
         if angle == 0:
             return
-        factor = 1.0015 ** angle
-        pos = event.position()
-        scene_pos_before = self.mapToScene(QPoint(int(pos.x()), int(pos.y())))
-        self.scale(factor, factor)
-        scene_pos_after = self.mapToScene(QPoint(int(pos.x()), int(pos.y())))
-        delta = scene_pos_after - scene_pos_before
-        self.translate(delta.x(), delta.y())
+        factor = math.exp(angle * _ZOOM_LOG_STEP)
+        # Scale about the scene point under the cursor: translate(p) . scale . translate(-p)
+        p = self.mapToScene(event.position().toPoint())
+        zoom = (
+            QTransform.fromTranslate(-p.x(), -p.y())
+            * QTransform.fromScale(factor, factor)
+            * QTransform.fromTranslate(p.x(), p.y())
+        )
+        self.setTransform(zoom * self.transform(), False)
 
     def mousePressEvent(self, event: QMouseEvent) -> None:  # noqa: N802
         if event.button() == Qt.MouseButton.MiddleButton or (
@@ -78,7 +119,12 @@ class Canvas(QGraphicsView):
         if self._panning:
             delta: QPoint = event.position().toPoint() - self._last_mouse_pos
             self._last_mouse_pos = event.position().toPoint()
-            self.translate(delta.x(), delta.y())
+            # Scroll by the drag in pixels so the grabbed point stays under the cursor;
+            # translate() would move in scene units, scaled by the zoom
+            hbar = self.horizontalScrollBar()
+            vbar = self.verticalScrollBar()
+            hbar.setValue(hbar.value() - delta.x())
+            vbar.setValue(vbar.value() - delta.y())
             event.accept()
             return
         super().mouseMoveEvent(event)
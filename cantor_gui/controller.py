@@ -1,19 +1,24 @@
 from __future__ import annotations
 
 import logging
+import math
 import time
-from dataclasses import dataclass
-from typing import List, Tuple
-
-from PySide6.QtCore import QRectF, QTimer
-from PySide6.QtGui import QColor, QImage, QPainter, QPen
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntFlag
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from PySide6.QtCore import QRectF, Qt, QTimer
+from PySide6.QtGui import QColor, QImage, QPainter, QPainterPath, QPen, QPicture
 from PySide6.QtSvg import QSvgGenerator
-from PySide6.QtWidgets import QFileDialog, QGraphicsPathItem, QInputDialog
+from PySide6.QtWidgets import QFileDialog, QGraphicsItem, QInputDialog
 
-from .renderers.cantor_dust import cantor_dust_points, points_to_rects_path
+from .items import DustItem, LineItem
+from .renderers.cantor_dust import cantor_dust_points
 from .renderers.cantor_line import (
-    Segment,
-    cantor_line_levels,
+    cantor_line_paths,
     cantor_line_segments,
     segments_to_path,
 )
@@ -22,13 +27,46 @@ from .renderers.cantor_line import (
 logger = logging.getLogger(__name__)
 
 
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+# Geometry depends only on the depth, so it is shared across style and layout
+# changes. Every caller gets the same arrays, so they are made read-only.
+@lru_cache(maxsize=16)
+def _line_segments(depth: int) -> Tuple[np.ndarray, float]:
+    starts, length = cantor_line_segments(depth)
+    return _read_only(starts), length
+
+
+@lru_cache(maxsize=16)
+def _dust_points(depth: int) -> np.ndarray:
+    return _read_only(cantor_dust_points(depth))
+
+
+# Width of the scene the constructions are mapped onto
+SCENE_WIDTH = 1000.0
+# Above this many primitives the canvas repaints the full viewport
+DENSE_ITEM_COUNT = 1024
+
+
+class Dirty(IntFlag):
+    """What a pending rebuild has to redo."""
+
+    NONE = 0
+    GEOM = 1  # mode, depth or level structure changed
+    LAYOUT = 2  # thickness or spacing changed; cached geometry is reused
+    STYLE = 4  # only colors changed; existing items are restyled
+
+
 @dataclass
 class Params:
     mode: str = "Line"  # or "Dust"
     depth: int = 6
     thickness: float = 4.0
-    fg: QColor = QColor("#1b1f23")
-    bg: QColor = QColor("#ffffff")
+    fg: QColor = field(default_factory=lambda: QColor("#1b1f23"))
+    bg: QColor = field(default_factory=lambda: QColor("#ffffff"))
     show_all_levels: bool = False
     spacing: int = 10
     loop: bool = False
@@ -43,8 +81,12 @@ class Controller:
         self.panels = panels
         self.statusbar = statusbar
         self.params = Params()
+        # Items currently in the scene and the mode they were built for
+        self._items: List[QGraphicsItem] = []
+        self._items_mode = self.params.mode
 
-        # Rebuild debounce timer
+        # Rebuild debounce timer, coalescing the dirty flags of all requests
+        self._dirty = Dirty.GEOM
         self._rebuild_timer = QTimer()
         self._rebuild_timer.setSingleShot(True)
         self._rebuild_timer.timeout.connect(self._rebuild_scene)
@@ -55,6 +97,10 @@ class Controller:
         self._anim_level = 0
         self._anim_start_time = 0.0
         self._frames = 0
+        # Per-level geometry played back by index: row paths (Line) or mapped frames (Dust)
+        self._anim_frames: list = []
+        # Recorded paint commands of the current scene, replayed by the SVG export
+        self._cached_picture: QPicture | None = None
 
         self._connect_signals()
         self._rebuild_scene()
@@ -76,36 +122,40 @@ class Controller:
         p.exportSvgRequested.connect(self.export_svg)
 
     # Panel handlers
-    def _request_rebuild(self) -> None:
+    def _request_rebuild(self, flags: Dirty) -> None:
+        self._dirty |= flags
+        if self._anim_timer.isActive():
+            # The next animation frame renders with the current params
+            return
         self._rebuild_timer.start(60)
 
     def _on_mode(self, mode: str) -> None:
         self.params.mode = mode
-        self._request_rebuild()
+        self._request_rebuild(Dirty.GEOM)
 
     def _on_depth(self, depth: int) -> None:
         self.params.depth = int(depth)
-        self._request_rebuild()
+        self._request_rebuild(Dirty.GEOM)
 
     def _on_thickness(self, value: float) -> None:
         self.params.thickness = float(value)
-        self._request_rebuild()
+        self._request_rebuild(Dirty.LAYOUT)
 
     def _on_fg(self, color: QColor) -> None:
         self.params.fg = color
-        self._request_rebuild()
+        self._request_rebuild(Dirty.STYLE)
 
     def _on_bg(self, color: QColor) -> None:
         self.params.bg = color
-        self._request_rebuild()
+        self._request_rebuild(Dirty.STYLE)
 
     def _on_show_all(self, show: bool) -> None:
         self.params.show_all_levels = bool(show)
-        self._request_rebuild()
+        self._request_rebuild(Dirty.GEOM)
 
     def _on_spacing(self, spacing: int) -> None:
         self.params.spacing = int(spacing)
-        self._request_rebuild()
+        self._request_rebuild(Dirty.LAYOUT)
 
     def _on_speed(self, ms: int) -> None:
         self.params.speed_ms = int(ms)
@@ -125,18 +175,48 @@ class Controller:
     def _start_anim(self) -> None:
         self._anim_level = 0
         self._frames = 0
+        self._prepare_anim()
         self._anim_start_time = time.monotonic()
         self._anim_timer.start(self.params.speed_ms)
 
+    def _prepare_anim(self) -> None:
+        """Lay the scene out at full depth and precompute the geometry of every level."""
+        self._dirty = Dirty.NONE
+        depth = self.params.depth
+        self._render_at_level(depth)
+        if self._items_mode == "Line":
+            self._anim_frames = [self._line_rows(level) for level in range(depth + 1)]
+        else:
+            item = self._items[0]
+            self._anim_frames = [
+                item.make_frame(_dust_points(level), level) for level in range(depth + 1)
+            ]
+
     def _stop_anim(self) -> None:
         self._anim_timer.stop()
         self._update_status(extra="")
+        if self._dirty:
+            # Apply parameter changes made while the animation was running
+            self._rebuild_timer.start(60)
 
     def _anim_step(self) -> None:
+        if self._needs_render(self._dirty):
+            # Parameters changed mid-animation; rebuild the frames
+            self._prepare_anim()
+        elif self._dirty:
+            dirty, self._dirty = self._dirty, Dirty.NONE
+            self._update_in_place(dirty)
         max_depth = self.params.depth
-        level = self._anim_level
-        self._render_at_level(level)
-        self._anim_level += 1
+        level = min(self._anim_level, max_depth)
+        item = self._items[0]
+        if self._items_mode == "Line":
+            item.set_rows(*self._anim_frames[level])
+            count = 2**level
+        else:
+            item.set_frame(self._anim_frames[level])
+            count = 4**level
+        self._cached_picture = None
+        self._anim_level = level + 1
         self._frames += 1
         if self._anim_level > max_depth:
             if self.params.loop:
@@ -146,61 +226,92 @@ class Controller:
         # FPS update
         elapsed = max(time.monotonic() - self._anim_start_time, 1e-6)
         fps = self._frames / elapsed
-        self._update_status(extra=f" | FPS: {fps:.1f}")
+        self._update_status(count=count, depth=level, extra=f" | FPS: {fps:.1f}")
 
     # Rendering
     def _rebuild_scene(self) -> None:
         if self._anim_timer.isActive():
             # defer rebuild during animation; current frame controls rebuild
             return
-        self._render_at_level(self.params.depth)
+        dirty, self._dirty = self._dirty, Dirty.NONE
+        if self._needs_render(dirty):
+            self._render_at_level(self.params.depth)
+        else:
+            self._update_in_place(dirty)
+
+    def _needs_render(self, dirty: Dirty) -> bool:
+        # Line layout moves rows and changes the pen; dust layout only resizes squares
+        if dirty & Dirty.GEOM:
+            return True
+        return bool(dirty & Dirty.LAYOUT) and self._items_mode == "Line"
+
+    def _update_in_place(self, dirty: Dirty) -> None:
+        """Apply changes that keep the current items: dust square size and colors."""
+        self._cached_picture = None
+        if dirty & Dirty.LAYOUT:
+            self._items[0].set_size(max(self.params.thickness, 1.0))
+            # Larger squares grow the item past the old scene rect
+            self.canvas.fit_to_scene()
+        if dirty & Dirty.STYLE:
+            self._restyle_scene()
+
+    def _line_rows(self, level: int) -> Tuple[List[QPainterPath], List[float]]:
+        """Row paths and their scene Y for the line construction at `level`."""
+        p = self.params
+        if p.show_all_levels:
+            # Each level is a row with spacing
+            y0 = p.spacing + p.thickness / 2.0
+            step = p.thickness + p.spacing
+            ys = [y0 + i * step for i in range(level + 1)]
+            rows = list(cantor_line_paths(level, 0.0, SCENE_WIDTH, y0, step, p.thickness))
+        else:
+            ys = [max(p.thickness + 2 * p.spacing, 1.0) / 2.0]
+            rows = [segments_to_path(_line_segments(level), 0.0, SCENE_WIDTH, ys[0], p.thickness)]
+        return rows, ys
 
     def _render_at_level(self, level: int) -> None:
         p = self.params
-        width = 1000.0
-        path_items: List[QGraphicsPathItem] = []
+        width = SCENE_WIDTH
+        path_items: List[QGraphicsItem] = []
         if p.mode == "Line":
             if p.show_all_levels:
-                levels = cantor_line_levels(level)
-                # Compute vertical layout: each level is a row with spacing
-                total_h = len(levels) * (p.thickness + p.spacing) + p.spacing
-                y = p.spacing + p.thickness / 2.0
-                for segs in levels:
-                    path = segments_to_path(segs, 0.0, width, y, p.thickness)
-                    item = QGraphicsPathItem(path)
-                    pen = QPen(p.fg)
-                    pen.setWidthF(p.thickness)
-                    item.setPen(pen)
-                    path_items.append(item)
-                    y += p.thickness + p.spacing
-                self.canvas.setSceneRect(0.0, 0.0, width, max(total_h, 1.0))
+                height = max((level + 1) * (p.thickness + p.spacing) + p.spacing, 1.0)
             else:
-                segs = cantor_line_segments(level)
                 height = max(p.thickness + 2 * p.spacing, 1.0)
-                y = height / 2.0
-                path = segments_to_path(segs, 0.0, width, y, p.thickness)
-                item = QGraphicsPathItem(path)
-                pen = QPen(p.fg)
-                pen.setWidthF(p.thickness)
-                item.setPen(pen)
-                path_items.append(item)
-                self.canvas.setSceneRect(0.0, 0.0, width, height)
+            pen = QPen(p.fg)
+            pen.setWidthF(p.thickness)
+            # Not device cached: refilling the cache repaints the whole item,
+            # which would defeat LineItem's culling of rows outside the view
+            item = LineItem(*self._line_rows(level), pen)
+            path_items.append(item)
+            self.canvas.setSceneRect(0.0, 0.0, width, height)
             count = 2 ** level
         else:  # Dust
             size = max(p.thickness, 1.0)
             height = width  # square
-            pts = cantor_dust_points(level)
-            path = points_to_rects_path(pts, 0.0, width, 0.0, height, size)
-            item = QGraphicsPathItem(path)
-            item.setBrush(p.fg)
-            item.setPen(QColor(Qt.GlobalColor.transparent))
+            pts = _dust_points(level)
+            item = DustItem(pts, level, 0.0, width, 0.0, height, size, p.fg, _dust_points)
+            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, False)
+            # Rasterize once per zoom level; panning blits the cached pixmap
+            item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
             path_items.append(item)
             self.canvas.setSceneRect(0.0, 0.0, width, height)
             count = 4 ** level
 
+        self.canvas.set_update_mode(count > DENSE_ITEM_COUNT)
         self.canvas.set_scene_items(path_items, p.bg)
+        self._items = path_items
+        self._items_mode = p.mode
+        self._cached_picture = None
         self._update_status(count=count, depth=level)
 
+    def _restyle_scene(self) -> None:
+        """Apply the current colors to the existing items without rebuilding geometry."""
+        p = self.params
+        for item in self._items:
+            item.set_color(p.fg)
+        self.canvas.set_background(p.bg)
+
     # Status bar
     def _update_status(self, count: int | None = None, depth: int | None = None, extra: str = "") -> None:
         if count is None:
@@ -213,6 +324,25 @@ class Controller:
         self.statusbar.showMessage(f"Depth: {depth} | Items: {count}{extra}")
 
     # Export
+    @contextmanager
+    def _exporting(self, vector: bool = False) -> Iterator[None]:
+        """Paint the items themselves while exporting, not their cached device pixmaps.
+
+        With `vector`, dust is painted as one path of squares instead of points.
+        """
+        modes = [item.cacheMode() for item in self._items]
+        for item in self._items:
+            item.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+            if vector and isinstance(item, DustItem):
+                item.set_vector_output(True)
+        try:
+            yield
+        finally:
+            for item, mode in zip(self._items, modes):
+                item.setCacheMode(mode)
+                if isinstance(item, DustItem):
+                    item.set_vector_output(False)
+
     def export_png(self) -> None:
         filename, _ = QFileDialog.getSaveFileName(
             None, "Export PNG", "cantor.png", "PNG Images (*.png)"
@@ -227,21 +357,55 @@ class Controller:
             return
         aspect = scene_rect.height() / max(scene_rect.width(), 1.0)
         height = int(max(round(width * aspect), 1))
+        native_w = max(math.ceil(scene_rect.width()), 1)
+        native_h = max(math.ceil(scene_rect.height()), 1)
+        if width <= native_w:
+            # Supersample: rasterize at the scene's own resolution, then resample down
+            img = self._render_image(scene_rect, native_w, native_h)
+            img = img.scaled(
+                width,
+                height,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        else:
+            # Rasterize at the requested size so enlarged output stays sharp
+            img = self._render_image(scene_rect, width, height)
+        img.save(filename)
+        logger.info("Exported PNG to %s", filename)
+
+    def _render_image(self, scene_rect: QRectF, width: int, height: int) -> QImage:
+        """Rasterize `scene_rect` of the scene into a `width` x `height` image."""
         img = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
         img.fill(self.params.bg)
         painter = QPainter(img)
         try:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-            # Transform to map scene to image
-            scale_x = width / scene_rect.width() if scene_rect.width() else 1.0
-            scale_y = height / scene_rect.height() if scene_rect.height() else 1.0
-            painter.translate(-scene_rect.left(), -scene_rect.top())
-            painter.scale(scale_x, scale_y)
-            self.canvas.scene().render(painter)
+            with self._exporting():
+                self.canvas.scene().render(
+                    painter,
+                    QRectF(0, 0, width, height),
+                    scene_rect,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                )
         finally:
             painter.end()
-        img.save(filename)
-        logger.info("Exported PNG to %s", filename)
+        return img
+
+    def _scene_picture(self, scene_rect: QRectF) -> QPicture:
+        """Paint commands of the scene in `scene_rect`, recorded once per scene change."""
+        if self._cached_picture is None:
+            picture = QPicture()
+            painter = QPainter(picture)
+            try:
+                painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+                target = QRectF(0, 0, scene_rect.width(), scene_rect.height())
+                with self._exporting(vector=True):
+                    self.canvas.scene().render(painter, target, scene_rect)
+            finally:
+                painter.end()
+            self._cached_picture = picture
+        return self._cached_picture
 
     def export_svg(self) -> None:
         filename, _ = QFileDialog.getSaveFileName(
@@ -268,7 +432,12 @@ class Controller:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
             # Background
             painter.fillRect(0, 0, scene_rect.width(), scene_rect.height(), self.params.bg)
-            self.canvas.scene().render(painter)
+            picture = self._scene_picture(scene_rect)
+            # drawPicture rescales from the picture's DPI to the generator's; undo it
+            painter.scale(
+                picture.logicalDpiX() / gen.logicalDpiX(), picture.logicalDpiY() / gen.logicalDpiY()
+            )
+            painter.drawPicture(0, 0, picture)
         finally:
             painter.end()
         logger.info("Exported SVG to %s", filename)
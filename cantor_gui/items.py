@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+
+from .renderers.cantor_dust import cantor_dust_points, points_to_rects_path
+
+
+# Scene geometry of one dust level: (depth, xs, ys, extent of the centers as
+# (left, top, right, bottom), or None when there are no points)
+DustFrame = Tuple[int, np.ndarray, np.ndarray, Tuple[float, float, float, float] | None]
+
+
+class DustItem(QGraphicsItem):
+    """Cantor dust drawn as square points in a single drawPointsNp call.
+
+    Every dust square has the same size, so instead of building a path with one
+    subpath per square the item keeps the scene coordinates of the centers as
+    NumPy arrays and strokes them with a square-capped pen as wide as a square.
+    Scene coordinates are stored as float32, which is ample for screen positions
+    and halves the memory touched on every paint.
+
+    When zoomed out far enough that squares are smaller than a device pixel, the
+    item draws a coarser level instead, one square per cluster of points. The
+    points of a coarser level come from `level_points`, so callers can share a
+    cache of them.
+
+    Vector exports would replay every point as its own element, so with
+    `set_vector_output` the item fills one streamed path of squares instead.
+
+    Animations map every level once with `make_frame` and then switch between
+    them with `set_frame`, which only swaps references.
+    """
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        depth: int,
+        x0: float,
+        x1: float,
+        y0: float,
+        y1: float,
+        size: float,
+        color: QColor,
+        level_points: Callable[[int], np.ndarray] = cantor_dust_points,
+    ) -> None:
+        super().__init__()
+        self._x0, self._x1, self._y0, self._y1 = x0, x1, y0, y1
+        self._size = size
+        self._color = QColor(color)
+        self._level_points = level_points
+        self._vector_output = False
+        # Coarser-level centers, keyed by (depth, level) so they survive frame swaps
+        self._lod_coords: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self.set_points(points, depth)
+
+    def set_points(self, points: np.ndarray, depth: int) -> None:
+        """Replace the dust points, given in [0,1]^2, keeping the scene mapping.
+
+        `depth` is the construction level the points belong to; it sets the
+        square size of the coarser levels drawn when zoomed out.
+        """
+        self.set_frame(self.make_frame(points, depth))
+
+    def make_frame(self, points: np.ndarray, depth: int) -> DustFrame:
+        """Map the points of one level to scene coordinates for `set_frame`."""
+        pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        xs, ys = self._map(pts)
+        if len(xs) == 0:
+            return depth, xs, ys, None
+        extent = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+        return depth, xs, ys, extent
+
+    def set_frame(self, frame: DustFrame) -> None:
+        """Show a level mapped by `make_frame`; nothing is recomputed per point."""
+        self.prepareGeometryChange()
+        self._depth, self._xs, self._ys, self._extent = frame
+        self._rects_path: QPainterPath | None = None
+        self._bounds = self._compute_bounds()
+
+    def _map(self, pts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        pts = np.asarray(pts, dtype=np.float32)
+        xs = np.ascontiguousarray(self._x0 + pts[:, 0] * (self._x1 - self._x0))
+        ys = np.ascontiguousarray(self._y0 + pts[:, 1] * (self._y1 - self._y0))
+        return xs, ys
+
+    def _cluster_extent(self, level: int) -> float:
+        """Span in [0,1] between the first and last point of a level-`level` cluster."""
+        return (1.0 / 3.0) ** level - (1.0 / 3.0) ** self._depth
+
+    def _cluster_centers(self, level: int) -> Tuple[np.ndarray, np.ndarray]:
+        coords = self._lod_coords.get((self._depth, level))
+        if coords is None:
+            offset = self._cluster_extent(level) / 2.0
+            coords = self._map(self._level_points(level) + offset)
+            self._lod_coords[(self._depth, level)] = coords
+        return coords
+
+    def _squares_path(self) -> QPainterPath:
+        if self._rects_path is None:
+            # Coordinates are already in scene units, so map [0,1] onto itself
+            centers = np.column_stack([self._xs, self._ys])
+            path = points_to_rects_path(centers, 0.0, 1.0, 0.0, 1.0, self._size)
+            # Squares may overlap when large; winding fill keeps overlaps solid
+            path.setFillRule(Qt.FillRule.WindingFill)
+            self._rects_path = path
+        return self._rects_path
+
+    def _compute_bounds(self) -> QRectF:
+        if self._extent is None:
+            return QRectF()
+        left, top, right, bottom = self._extent
+        half = self._size / 2.0
+        return QRectF(left - half, top - half, right - left + self._size, bottom - top + self._size)
+
+    def set_color(self, color: QColor) -> None:
+        self._color = QColor(color)
+        self.update()
+
+    def set_size(self, size: float) -> None:
+        self.prepareGeometryChange()
+        self._size = size
+        self._rects_path = None
+        self._bounds = self._compute_bounds()
+
+    def set_vector_output(self, enabled: bool) -> None:
+        """Paint the squares as one filled path, for painting into vector devices."""
+        self._vector_output = enabled
+
+    def boundingRect(self) -> QRectF:  # noqa: N802
+        return self._bounds
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionGraphicsItem,
+        widget: QWidget | None = None,
+    ) -> None:
+        if self._vector_output:
+            painter.fillPath(self._squares_path(), self._color)
+            return
+        xs, ys, size = self._xs, self._ys, self._size
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if 0.0 < size * lod < 1.0 and self._depth > 0:
+            # Sub-pixel squares: draw the smallest coarser level whose clusters
+            # reach a device pixel, each as the bounding square of its points
+            k = min(math.ceil(math.log(1.0 / (size * lod), 3)), self._depth)
+            level = self._depth - k
+            xs, ys = self._cluster_centers(level)
+            size += self._cluster_extent(level) * (self._x1 - self._x0)
+        pen = QPen(self._color, size)
+        pen.setCapStyle(Qt.PenCapStyle.SquareCap)
+        painter.setPen(pen)
+        painter.drawPointsNp(xs, ys)
+
+
+class LineItem(QGraphicsItem):
+    """Rows of horizontal Cantor line segments stroked with one pen.
+
+    Each row is its own QPainterPath at a known scene Y, sorted top to bottom.
+    paint() only draws the rows that intersect the exposed rect, so zooming in
+    on one row of a tall show-all-levels layout costs that row alone.
+    """
+
+    def __init__(self, rows: List[QPainterPath], ys: Sequence[float], pen: QPen) -> None:
+        super().__init__()
+        self._pen = QPen(pen)
+        # paint() culls rows against option.exposedRect, which Qt only fills in
+        # with the extended style option
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+        self.set_rows(rows, ys)
+
+    def set_rows(self, rows: List[QPainterPath], ys: Sequence[float]) -> None:
+        """Replace the rows; `ys` holds the scene Y of each row in ascending order."""
+        self.prepareGeometryChange()
+        self._rows = rows
+        self._ys = list(ys)
+        self._bounds = self._compute_bounds()
+
+    def _compute_bounds(self) -> QRectF:
+        rect = QRectF()
+        for path in self._rows:
+            rect = rect.united(path.controlPointRect())
+        half = self._pen.widthF() / 2.0
+        return rect.adjusted(-half, -half, half, half)
+
+    def set_color(self, color: QColor) -> None:
+        self._pen.setColor(color)
+        self.update()
+
+    def boundingRect(self) -> QRectF:  # noqa: N802
+        return self._bounds
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionGraphicsItem,
+        widget: QWidget | None = None,
+    ) -> None:
+        exposed = option.exposedRect
+        half = self._pen.widthF() / 2.0
+        first = bisect_left(self._ys, exposed.top() - half)
+        last = bisect_right(self._ys, exposed.bottom() + half)
+        painter.setPen(self._pen)
+        for path in self._rows[first:last]:
+            painter.drawPath(path)
@@ -16,12 +16,12 @@ logger = logging.getLogger(__name__)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self) -> None:
+    def __init__(self, use_opengl: bool = True) -> None:
         super().__init__()
         self.setWindowTitle("Cantor GUI")
         self.resize(1100, 720)
 
-        self.canvas = Canvas(self)
+        self.canvas = Canvas(self, use_opengl=use_opengl)
         self.panels = ControlsPanel(self)
         self.controller = Controller(self.canvas, self.panels, self.statusBar())
 
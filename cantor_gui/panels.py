@@ -21,7 +21,14 @@ from PySide6.QtWidgets import (
     QColorDialog,
 )
 
-from .utils.colors import DEFAULT_BG_HEX, DEFAULT_FG_HEX, hex_to_qcolor, qcolor_to_hex, suitable_text_color
+from .utils.colors import (
+    DEFAULT_BG_HEX,
+    DEFAULT_FG_HEX,
+    hex_to_qcolor,
+    qcolor_key,
+    qcolor_to_hex,
+    suitable_text_color,
+)
 
 
 class ControlsPanel(QWidget):
@@ -179,14 +186,14 @@ class ControlsPanel(QWidget):
 
     def _pick_fg(self) -> None:
         color = QColorDialog.getColor(self.fg, self, "Select Foreground Color")
-        if color.isValid():
+        if color.isValid() and qcolor_key(color) != qcolor_key(self.fg):
             self.fg = color
             self._update_color_buttons()
             self.fgColorChanged.emit(self.fg)
 
     def _pick_bg(self) -> None:
         color = QColorDialog.getColor(self.bg, self, "Select Background Color")
-        if color.isValid():
+        if color.isValid() and qcolor_key(color) != qcolor_key(self.bg):
             self.bg = color
             self._update_color_buttons()
             self.bgColorChanged.emit(self.bg)
@@ -0,0 +1,60 @@
+"""Optional Numba-compiled kernels for the Cantor generators.
+
+Numba is not a required dependency. When it is not installed,
+``line_numerators`` and ``line_levels`` are ``None`` and the public generators
+fall back to their NumPy implementations. The plain Python bodies below are
+what Numba compiles.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+
+def _line_numerators(depth):
+    """Exact numerators over 3^depth of the 2^depth final-level starts, ascending.
+
+    The first n entries are doubled into the next n once per level, adding the
+    finest digit's 2 * 3^0 first. Valid while 3^depth fits in uint64.
+    """
+    nums = np.empty(1 << depth, dtype=np.uint64)
+    nums[0] = 0
+    n = 1
+    step = np.uint64(2)
+    for _ in range(depth):
+        for i in range(n):
+            nums[n + i] = nums[i] + step
+        n *= 2
+        step *= np.uint64(3)
+    return nums
+
+
+def _line_levels(depth):
+    """Starts of levels 0..depth in one buffer; level d is out[2^d - 1 : 2^(d+1) - 1]."""
+    out = np.empty((2 << depth) - 1)
+    out[0] = 0.0
+    n = 1
+    for d in range(depth):
+        base = n - 1
+        nxt = base + n
+        # Same offset as the NumPy fill, so both round identically
+        offset = 2.0 * (1.0 / 3.0) ** (d + 1)
+        for i in range(n):
+            s = out[base + i]
+            out[nxt + 2 * i] = s
+            out[nxt + 2 * i + 1] = s + offset
+        n *= 2
+    return out
+
+
+if numba is not None:
+    line_numerators = numba.njit("uint64[::1](int32)", cache=True)(_line_numerators)
+    line_levels = numba.njit("float64[::1](int32)", cache=True)(_line_levels)
+else:
+    line_numerators = None
+    line_levels = None
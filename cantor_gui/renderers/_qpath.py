@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+from PySide6.QtCore import QByteArray, QDataStream, QIODevice
+from PySide6.QtGui import QPainterPath
+
+
+# QPainterPath::ElementType values
+MOVE_TO = 0
+LINE_TO = 1
+
+# Element layout of QPainterPath's QDataStream serialization (big-endian)
+_ELEMENT_DTYPE = np.dtype([("type", ">i4"), ("x", ">f8"), ("y", ">f8")])
+# Element count before the elements; start of the last subpath and fill rule after
+_HEADER = struct.Struct(">i")
+_TRAILER = struct.Struct(">ii")
+
+
+def path_from_elements(types: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> QPainterPath:
+    """Build a QPainterPath from parallel arrays of element types and coordinates.
+
+    The elements are packed into the binary format read by Qt's
+    ``QDataStream >> QPainterPath`` operator and deserialized in one call, so the
+    per-element work runs in Qt's C++ loop instead of one binding call per
+    moveTo/lineTo (the same technique as pyqtgraph's ``arrayToQPath``).
+    """
+    n = len(types)
+    path = QPainterPath()
+    if n == 0:
+        return path
+    moves = np.flatnonzero(np.asarray(types) == MOVE_TO)
+    c_start = int(moves[-1]) if len(moves) else 0
+    # Count, elements and trailer are written into one buffer that Qt copies once
+    data = bytearray(_HEADER.size + n * _ELEMENT_DTYPE.itemsize + _TRAILER.size)
+    _HEADER.pack_into(data, 0, n)
+    elements = np.frombuffer(data, dtype=_ELEMENT_DTYPE, count=n, offset=_HEADER.size)
+    elements["type"] = types
+    elements["x"] = xs
+    elements["y"] = ys
+    _TRAILER.pack_into(data, len(data) - _TRAILER.size, c_start, 0)
+    # Keep the byte array referenced while the stream reads from it
+    buf = QByteArray(data)
+    stream = QDataStream(buf, QIODevice.OpenModeFlag.ReadOnly)
+    stream >> path
+    return path
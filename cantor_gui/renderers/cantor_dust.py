@@ -1,46 +1,40 @@
 from __future__ import annotations
 
-from itertools import product
-from typing import Iterable, List, Tuple
+from typing import Iterable, Tuple
 
-from PySide6.QtCore import QRectF
+import numpy as np
 from PySide6.QtGui import QPainterPath
 
+from ._qpath import LINE_TO, MOVE_TO, path_from_elements
+from .cantor_line import cantor_line_starts
 
-Point = Tuple[float, float]
 
+Point = Tuple[float, float]  # (x, y) within [0,1]^2; one row of a point array
 
-def cantor_dust_points(depth: int) -> List[Point]:
+_RECT_ELEMENTS = np.array([MOVE_TO, LINE_TO, LINE_TO, LINE_TO, LINE_TO], dtype=np.int32)
+
+
+def cantor_dust_points(depth: int) -> np.ndarray:
     """Generate points of the 2D Cantor dust at given depth.
 
     Constructed as the Cartesian product of the 1D Cantor set with itself.
     Points are derived from base-3 digits of length n with digits in {0,2}.
 
+    Returns a float64 array of shape (4^n, 2). The 2^n coordinates of one axis
+    are the line starts from `cantor_line_starts`, combined with a meshgrid, so
+    no Python loop runs per point.
+
     For depth n there are 4^n points. Complexity: O(4^n) time and space.
     """
     if depth < 0:
         raise ValueError("depth must be >= 0")
-    if depth == 0:
-        return [(0.0, 0.0)]
-
-    digits = [0.0, 2.0]
-    scale = 1.0 / 3.0
-    points: List[Point] = []
-    # Generate all base-3 strings of length depth with digits 0 or 2
-    for dx in product(digits, repeat=depth):
-        x = 0.0
-        for i, d in enumerate(dx):
-            x += d * (scale ** (i + 1))
-        for dy in product(digits, repeat=depth):
-            y = 0.0
-            for j, d2 in enumerate(dy):
-                y += d2 * (scale ** (j + 1))
-            points.append((x, y))
-    return points
+    coords = cantor_line_starts(depth)
+    xs, ys = np.meshgrid(coords, coords, indexing="ij")
+    return np.column_stack([xs.ravel(), ys.ravel()])
 
 
 def points_to_rects_path(
-    points: Iterable[Point],
+    points: Iterable[Point] | np.ndarray,
     x0: float,
     x1: float,
     y0: float,
@@ -50,15 +44,19 @@ def points_to_rects_path(
     """Pack many tiny squares centered on the points into one QPainterPath.
 
     Maps [0,1]^2 onto [x0,x1] x [y0,y1]. `size` is the side length in scene units.
+    Each square is written as a closed subpath of five elements, the same
+    elements QPainterPath.addRect emits, and the whole path is streamed at once.
+    Corner coordinates are computed in float32 and widened only when written.
     """
-    path = QPainterPath()
-    sx = (x1 - x0)
-    sy = (y1 - y0)
+    pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
     half = size / 2.0
-    for x, y in points:
-        cx = x0 + x * sx
-        cy = y0 + y * sy
-        rect = QRectF(cx - half, cy - half, size, size)
-        path.addRect(rect)
-    return path
-
+    cxs = x0 + pts[:, 0] * (x1 - x0)
+    cys = y0 + pts[:, 1] * (y1 - y0)
+    left = (cxs - half)[:, None]
+    right = (cxs + half)[:, None]
+    top = (cys - half)[:, None]
+    bottom = (cys + half)[:, None]
+    xs = np.hstack([left, right, right, left, left]).ravel()
+    ys = np.hstack([top, top, bottom, bottom, top]).ravel()
+    types = np.tile(_RECT_ELEMENTS, len(pts))
+    return path_from_elements(types, xs, ys)
@@ -1,61 +1,103 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
-from PySide6.QtGui import QPainterPath, QPen
-from PySide6.QtCore import QPointF
+import numpy as np
+from PySide6.QtGui import QPainterPath
 
+from . import _kernels
+from ._qpath import LINE_TO, MOVE_TO, path_from_elements
 
-Segment = Tuple[float, float]  # (start, length) within [0,1]
 
+# Packed (start, length) record for segments of differing lengths, within [0,1]
+SEGMENT_DTYPE = np.dtype([("start", np.float64), ("length", np.float64)])
 
-def cantor_line_segments(depth: int) -> List[Segment]:
-    """Return the final level segments of the Cantor set at given depth.
+_SEGMENT_ELEMENTS = np.array([MOVE_TO, LINE_TO], dtype=np.int32)
 
-    Iterative middle-third removal on [0,1]. At depth n there are 2^n segments of
-    length (1/3)^n.
+# (1/3)^i for every depth with a representable segment count
+_THIRD_POW = tuple((1.0 / 3.0) ** i for i in range(64))
 
-    Complexity: O(2^n) time and space.
+
+def _double_starts(depth: int) -> np.ndarray:
+    # Doubling on exact integer numerators over 3^depth
+    if _kernels.line_numerators is not None:
+        nums = _kernels.line_numerators(depth)
+    else:
+        nums = np.empty(1 << depth, dtype=np.uint64)
+        nums[0] = 0
+        n = 1
+        for k in range(depth, 0, -1):
+            np.add(nums[:n], np.uint64(2 * 3 ** (depth - k)), out=nums[n : 2 * n])
+            n *= 2
+    return nums / float(3**depth)
+
+
+# Starts for the small preview depths, where array setup would dominate the work
+_SMALL_STARTS = tuple(_double_starts(depth) for depth in range(4))
+
+
+def cantor_line_starts(depth: int) -> np.ndarray:
+    """Return the left endpoints of the 2^depth final-level segments, ascending.
+
+    Start k is the sum of 2 * 3^-(i+1) over the set bits i of k, most
+    significant first. Rather than evaluating that sum per index, a preallocated
+    array of integer numerators over 3^depth is doubled once per level with the
+    finest offset added first, which costs O(2^n) in total instead of
+    O(n * 2^n). Up to depth 33 the numerators are below 2^53, so each start is
+    the correctly rounded quotient; beyond that the numerators themselves lose
+    precision when widened to float64. Depths below 4 are copied from
+    a table built at import. The numerators are filled by the Numba kernel from
+    `_kernels` when Numba is installed.
     """
     if depth < 0:
         raise ValueError("depth must be >= 0")
-    segments: List[Segment] = [(0.0, 1.0)]
-    for _ in range(depth):
-        next_segs: List[Segment] = []
-        for s, L in segments:
-            third = L / 3.0
-            next_segs.append((s, third))
-            next_segs.append((s + 2.0 * third, third))
-        segments = next_segs
-    return segments
+    if depth < len(_SMALL_STARTS):
+        return _SMALL_STARTS[depth].copy()
+    return _double_starts(depth)
 
 
-def cantor_line_levels(depth: int) -> List[List[Segment]]:
-    """Return list of levels 0..depth, each a list of segments (start,length).
+def cantor_line_segments(depth: int) -> Tuple[np.ndarray, float]:
+    """Return the final level segments of the Cantor set at given depth.
 
-    Level 0 is [(0,1)]. Each subsequent level removes the middle third from each
-    segment of the previous level.
+    Middle-third removal on [0,1]. At depth n there are 2^n segments, all of
+    length (1/3)^n, so they are returned as a pair (starts, length): a float64
+    array of the 2^n starts in ascending order and the shared length.
+
+    Complexity: O(2^n) time and space.
+    """
+    return cantor_line_starts(depth), _THIRD_POW[depth]
+
+
+def cantor_line_levels(depth: int) -> List[Tuple[np.ndarray, float]]:
+    """Return levels 0..depth, each a (starts, length) pair like `cantor_line_segments`.
+
+    Level 0 is ([0], 1). Each subsequent level removes the middle third from
+    each segment of the previous level, children placed next to their parent so
+    every level is ascending. The starts of all levels are written into one
+    preallocated buffer of 2^(n+1) - 1 floats, level i at offset 2^i - 1, and
+    returned as views into it. Uses the Numba kernel from `_kernels` when Numba
+    is installed. The GUI draws its rows with `cantor_line_paths` instead; this
+    is the materialized form for callers that want every level.
 
     Complexity: O(2^(n+1)) total segments generated across all levels.
     """
     if depth < 0:
         raise ValueError("depth must be >= 0")
-    levels: List[List[Segment]] = []
-    current: List[Segment] = [(0.0, 1.0)]
-    levels.append(current)
-    for _ in range(depth):
-        next_segs: List[Segment] = []
-        for s, L in current:
-            third = L / 3.0
-            next_segs.append((s, third))
-            next_segs.append((s + 2.0 * third, third))
-        current = next_segs
-        levels.append(current)
-    return levels
+    if _kernels.line_levels is not None:
+        buf = _kernels.line_levels(depth)
+    else:
+        buf = np.empty((2 << depth) - 1)
+        buf[0] = 0.0
+        for d in range(depth):
+            n = 1 << d
+            prev = buf[n - 1 : 2 * n - 1]
+            buf[2 * n - 1 : 4 * n - 1 : 2] = prev
+            buf[2 * n : 4 * n - 1 : 2] = prev + 2.0 * _THIRD_POW[d + 1]
+    return [(buf[(1 << d) - 1 : (2 << d) - 1], _THIRD_POW[d]) for d in range(depth + 1)]
 
 
 def segments_to_path(
-    segments: Iterable[Segment],
+    segments: Tuple[np.ndarray, float] | Iterable[Tuple[float, float]] | np.ndarray,
     x0: float,
     x1: float,
     y: float,
@@ -63,15 +105,50 @@ def segments_to_path(
 ) -> QPainterPath:
     """Pack many horizontal line segments into a single QPainterPath.
 
-    Maps [0,1] along X to [x0,x1] at fixed scene Y. Thickness is used by the pen
-    when stroking the path.
+    `segments` is either a (starts, length) pair as returned by
+    `cantor_line_segments`, an array of `SEGMENT_DTYPE` records or (start,
+    length) rows. Maps [0,1] along X to [x0,x1] at fixed scene Y. Thickness is
+    used by the pen when stroking the path. Scene coordinates are computed in
+    float32 and each segment becomes a moveTo/lineTo element pair, streamed
+    into the path at once.
     """
-    path = QPainterPath()
-    scale = (x1 - x0)
-    for s, L in segments:
-        xs = x0 + s * scale
-        xe = xs + L * scale
-        path.moveTo(QPointF(xs, y))
-        path.lineTo(QPointF(xe, y))
-    return path
+    scale = x1 - x0
+    if isinstance(segments, tuple) and len(segments) == 2 and np.ndim(segments[1]) == 0:
+        starts, length = segments
+        xs = x0 + np.asarray(starts, dtype=np.float32) * scale
+        xe = xs + np.float32(length * scale)
+    else:
+        if isinstance(segments, np.ndarray) and segments.dtype == SEGMENT_DTYPE:
+            # Zero-copy view of the records as (start, length) rows
+            segments = np.ascontiguousarray(segments).view(np.float64)
+        segs = np.asarray(segments, dtype=np.float32).reshape(-1, 2)
+        xs = x0 + segs[:, 0] * scale
+        xe = xs + segs[:, 1] * scale
+    types = np.tile(_SEGMENT_ELEMENTS, len(xs))
+    return path_from_elements(types, np.column_stack([xs, xe]).ravel(), y)
+
+
+def cantor_line_paths(
+    depth: int,
+    x0: float,
+    x1: float,
+    y0: float,
+    row_step: float,
+    thickness: float,
+) -> Iterator[QPainterPath]:
+    """Yield one row path per level 0..depth, level i at scene Y `y0 + i * row_step`.
 
+    Fuses `cantor_line_levels` with `segments_to_path`: only the current
+    level's starts are kept, each level is doubled from the previous one and
+    turned into its path before the next is computed.
+    """
+    if depth < 0:
+        raise ValueError("depth must be >= 0")
+    starts = np.zeros(1)
+    for d in range(depth + 1):
+        yield segments_to_path((starts, _THIRD_POW[d]), x0, x1, y0 + d * row_step, thickness)
+        if d < depth:
+            children = np.empty(2 * len(starts))
+            children[0::2] = starts
+            np.add(starts, 2.0 * _THIRD_POW[d + 1], out=children[1::2])
+            starts = children
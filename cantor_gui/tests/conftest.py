@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+# Widget tests run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
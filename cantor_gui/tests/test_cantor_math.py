@@ -2,29 +2,128 @@ from __future__ import annotations
 
 import math
 
-from cantor_gui.renderers.cantor_dust import cantor_dust_points
-from cantor_gui.renderers.cantor_line import cantor_line_segments
+import numpy as np
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QImage, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QStyleOptionGraphicsItem
+
+from cantor_gui.items import DustItem, LineItem
+from cantor_gui.renderers import _kernels
+from cantor_gui.renderers.cantor_dust import cantor_dust_points, points_to_rects_path
+from cantor_gui.renderers.cantor_line import (
+    cantor_line_levels,
+    cantor_line_paths,
+    cantor_line_segments,
+    cantor_line_starts,
+    segments_to_path,
+)
 
 
 def test_line_depth0_one_segment():
-    segs = cantor_line_segments(0)
-    assert len(segs) == 1
-    s, L = segs[0]
+    starts, L = cantor_line_segments(0)
+    assert len(starts) == 1
     assert math.isclose(L, 1.0)
-    assert 0.0 <= s <= 1.0
+    assert 0.0 <= starts[0] <= 1.0
 
 
 def test_line_count_and_length():
     for n in range(0, 8):
-        segs = cantor_line_segments(n)
-        assert len(segs) == 2 ** n
-        if segs:
-            # All final segments have length (1/3)^n
-            expected = (1.0 / 3.0) ** n
-            for s, L in segs:
-                assert math.isclose(L, expected)
-                assert 0.0 <= s <= 1.0
-                assert 0.0 <= s + L <= 1.0000001
+        starts, L = cantor_line_segments(n)
+        assert len(starts) == 2 ** n
+        # All final segments have length (1/3)^n
+        assert math.isclose(L, (1.0 / 3.0) ** n)
+        for s in starts:
+            assert 0.0 <= s <= 1.0
+            assert 0.0 <= s + L <= 1.0
+
+
+def test_line_starts_are_base3_digit_sums():
+    for n in range(0, 8):
+        starts = cantor_line_starts(n)
+        for k, s in enumerate(starts):
+            # Bit i of k, most significant first, selects digit 2 at position i
+            expected = sum(2.0 * 3.0 ** -(i + 1) for i in range(n) if (k >> (n - 1 - i)) & 1)
+            assert math.isclose(s, expected, abs_tol=1e-12)
+
+
+def test_levels_shapes_and_last_level():
+    for n in range(0, 7):
+        levels = cantor_line_levels(n)
+        assert [len(starts) for starts, _ in levels] == [2**i for i in range(n + 1)]
+        for i, (starts, L) in enumerate(levels):
+            assert math.isclose(L, (1.0 / 3.0) ** i)
+            assert np.allclose(starts, cantor_line_starts(i))
+
+
+def test_line_paths_match_levels():
+    n = 5
+    paths = list(cantor_line_paths(n, 0.0, 100.0, 2.0, 3.0, 1.0))
+    assert len(paths) == n + 1
+    for i, (path, segs) in enumerate(zip(paths, cantor_line_levels(n))):
+        assert path == segments_to_path(segs, 0.0, 100.0, 2.0 + 3.0 * i, 1.0)
+
+
+def _assert_same_elements(path, reference):
+    # Streamed coordinates are computed in float32, so compare them with a tolerance
+    assert path.elementCount() == reference.elementCount()
+    assert path.fillRule() == reference.fillRule()
+    for i in range(reference.elementCount()):
+        got, want = path.elementAt(i), reference.elementAt(i)
+        assert got.type == want.type
+        assert math.isclose(got.x, want.x, abs_tol=1e-4)
+        assert math.isclose(got.y, want.y, abs_tol=1e-4)
+
+
+def test_streamed_line_path_matches_move_line_pairs():
+    starts, length = cantor_line_segments(3)
+    reference = QPainterPath()
+    for s in starts:
+        reference.moveTo(10.0 + s * 90.0, 7.0)
+        reference.lineTo(10.0 + (s + length) * 90.0, 7.0)
+    _assert_same_elements(segments_to_path((starts, length), 10.0, 100.0, 7.0, 1.0), reference)
+
+
+def test_streamed_dust_path_matches_add_rect():
+    pts = cantor_dust_points(2)
+    reference = QPainterPath()
+    for x, y in pts:
+        reference.addRect(QRectF(5.0 + x * 90.0 - 1.5, 5.0 + y * 90.0 - 1.5, 3.0, 3.0))
+    _assert_same_elements(points_to_rects_path(pts, 5.0, 95.0, 5.0, 95.0, 3.0), reference)
+
+
+def test_line_item_skips_rows_outside_exposed_rect():
+    ys = [5.0, 15.0, 25.0]
+    rows = [segments_to_path(cantor_line_segments(0), 0.0, 100.0, y, 2.0) for y in ys]
+    item = LineItem(rows, ys, QPen(QColor("black"), 2.0))
+    img = QImage(100, 30, QImage.Format.Format_ARGB32)
+    img.fill(0)
+    option = QStyleOptionGraphicsItem()
+    option.exposedRect = QRectF(0.0, 12.0, 100.0, 6.0)
+    painter = QPainter(img)
+    item.paint(painter, option)
+    painter.end()
+    # Only the middle row intersects the exposed rect
+    assert [img.pixelColor(50, int(y)).alpha() for y in ys] == [0, 255, 0]
+
+
+def test_dust_item_lod_uses_given_depth():
+    requested = []
+
+    def level_points(level):
+        requested.append(level)
+        return cantor_dust_points(level)
+
+    # A subset of a depth-3 level; its length says nothing about the depth
+    pts = cantor_dust_points(3)[:10]
+    item = DustItem(pts, 3, 0.0, 100.0, 0.0, 100.0, 1.0, QColor("black"), level_points)
+    img = QImage(60, 60, QImage.Format.Format_ARGB32)
+    img.fill(0)
+    painter = QPainter(img)
+    # Squares shrink to half a pixel, so one level coarser is drawn
+    painter.scale(0.5, 0.5)
+    item.paint(painter, QStyleOptionGraphicsItem())
+    painter.end()
+    assert requested == [2]
 
 
 def test_dust_depth0_one_point():
@@ -43,3 +142,33 @@ def test_dust_counts_and_bounds():
             assert 0.0 <= x <= 1.0
             assert 0.0 <= y <= 1.0
 
+
+def test_dust_is_product_of_line_starts():
+    for n in range(0, 5):
+        starts, _ = cantor_line_segments(n)
+        pts = cantor_dust_points(n)
+        expected = [(x, y) for x in starts for y in starts]
+        assert len(pts) == len(expected)
+        for (x, y), (ex, ey) in zip(pts, expected):
+            assert math.isclose(x, ex, abs_tol=1e-12)
+            assert math.isclose(y, ey, abs_tol=1e-12)
+
+
+def test_kernels_match_numpy_generators():
+    # The plain Python bodies are what Numba compiles, so check them directly
+    for n in range(0, 5):
+        starts = cantor_line_starts(n)
+        assert np.array_equal(_kernels._line_numerators(n) / float(3**n), starts)
+        levels = np.concatenate([starts for starts, _ in cantor_line_levels(n)])
+        assert np.array_equal(_kernels._line_levels(n), levels)
+
+
+def test_dust_item_set_frame_swaps_mapped_level():
+    item = DustItem(cantor_dust_points(2), 2, 0.0, 90.0, 0.0, 90.0, 2.0, QColor("black"))
+    frame = item.make_frame(cantor_dust_points(1), 1)
+    item.set_frame(frame)
+    # The precomputed scene arrays are used as they are, not mapped again
+    assert item._xs is frame[1] and item._ys is frame[2]
+    assert item.boundingRect() == QRectF(-1.0, -1.0, 62.0, 62.0)
+    item.set_size(4.0)
+    assert item.boundingRect() == QRectF(-2.0, -2.0, 64.0, 64.0)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QEvent, QPoint, QPointF, Qt
+from PySide6.QtGui import QColor, QMouseEvent, QWheelEvent
+from PySide6.QtWidgets import QGraphicsRectItem
+
+from cantor_gui.canvas import Canvas
+
+
+def _wheel(canvas: Canvas, pos: QPoint, angle: int) -> None:
+    canvas.wheelEvent(
+        QWheelEvent(
+            QPointF(pos),
+            QPointF(pos),
+            QPoint(),
+            QPoint(0, angle),
+            Qt.MouseButton.NoButton,
+            Qt.KeyboardModifier.NoModifier,
+            Qt.ScrollPhase.NoScrollPhase,
+            False,
+        )
+    )
+
+
+def _mouse(kind: QEvent.Type, pos: QPoint, buttons: Qt.MouseButton) -> QMouseEvent:
+    return QMouseEvent(
+        kind,
+        QPointF(pos),
+        QPointF(pos),
+        Qt.MouseButton.MiddleButton,
+        buttons,
+        Qt.KeyboardModifier.NoModifier,
+    )
+
+
+def _zoomed_canvas() -> Canvas:
+    canvas = Canvas(use_opengl=False)
+    canvas.resize(400, 300)
+    canvas.show()
+    canvas.set_scene_items([QGraphicsRectItem(0.0, 0.0, 1000.0, 1000.0)], QColor("white"))
+    for _ in range(8):
+        _wheel(canvas, QPoint(200, 150), 120)
+    return canvas
+
+
+def test_wheel_zoom_keeps_point_under_cursor(qapp):
+    canvas = _zoomed_canvas()
+    cursor = QPoint(120, 90)
+    before = canvas.mapToScene(cursor)
+    _wheel(canvas, cursor, 120)
+    assert canvas.transform().m11() > 1.0
+    after = canvas.mapToScene(cursor)
+    assert abs(after.x() - before.x()) < 1.0
+    assert abs(after.y() - before.y()) < 1.0
+
+
+def test_pan_keeps_grabbed_point_under_cursor(qapp):
+    canvas = _zoomed_canvas()
+    assert canvas.transform().m11() != 1.0
+    start, end = QPoint(200, 150), QPoint(260, 110)
+    grabbed = canvas.mapToScene(start)
+    middle = Qt.MouseButton.MiddleButton
+    canvas.mousePressEvent(_mouse(QEvent.Type.MouseButtonPress, start, middle))
+    canvas.mouseMoveEvent(_mouse(QEvent.Type.MouseMove, end, middle))
+    canvas.mouseReleaseEvent(_mouse(QEvent.Type.MouseButtonRelease, end, Qt.MouseButton.NoButton))
+    assert canvas.mapToScene(end) == grabbed
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+from PySide6.QtGui import QColor
+
+from cantor_gui.utils.colors import (
+    _parse_hex,
+    hex_to_qcolor,
+    parse_hex_pair,
+    qcolor_key,
+    suitable_text_color,
+)
+
+
+def test_hex_to_qcolor_accepts_long_and_short_forms():
+    assert hex_to_qcolor("#1b1f23").name() == "#1b1f23"
+    assert hex_to_qcolor("1B1F23").name() == "#1b1f23"
+    assert hex_to_qcolor("#abc").name() == "#aabbcc"
+    assert hex_to_qcolor("  #ffffff ").name() == "#ffffff"
+
+
+@pytest.mark.parametrize(
+    "bad", ["", "   ", "red", "gggggg", "#0x12ab", "0x12ab", "0X00ff", "+fffff", "ff_ff0", "#١٢٣٤٥٦"]
+)
+def test_hex_to_qcolor_rejects_invalid(bad):
+    with pytest.raises(ValueError):
+        hex_to_qcolor(bad)
+
+
+def test_hex_to_qcolor_returns_independent_copies():
+    first = hex_to_qcolor("#ff0000")
+    first.setGreen(255)
+    assert hex_to_qcolor("#ff0000").name() == "#ff0000"
+
+
+def test_hex_to_qcolor_parses_each_string_once():
+    _parse_hex.cache_clear()
+    hex_to_qcolor("#2a4b6c")
+    hex_to_qcolor("#2a4b6c")
+    info = _parse_hex.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_parse_hex_pair_defaults():
+    fg, bg = parse_hex_pair(None, "#000000")
+    assert fg.name() == "#1b1f23"
+    assert bg.name() == "#000000"
+
+
+def test_suitable_text_color_contrast():
+    assert suitable_text_color(QColor("#ffffff")).name() == "#000000"
+    assert suitable_text_color(QColor("#000000")).name() == "#ffffff"
+    assert suitable_text_color(QColor("#1b1f23")).name() == "#ffffff"
+
+
+def test_suitable_text_color_returns_shared_colors():
+    assert suitable_text_color(QColor("#ffffff")) is suitable_text_color(QColor("#eeeeee"))
+    assert suitable_text_color(QColor("#000000")) is suitable_text_color(QColor("#1b1f23"))
+
+
+def test_suitable_text_color_matches_float_luminance():
+    # Grays sit exactly on the weights' sum, so the threshold is unchanged
+    for v in range(256):
+        expected = "#000000" if v > 186 else "#ffffff"
+        assert suitable_text_color(QColor(v, v, v)).name() == expected
+    # Elsewhere the 1/256 weights only differ within 0.4 of the threshold
+    for r in range(0, 256, 15):
+        for g in range(0, 256, 15):
+            for b in range(0, 256, 15):
+                luminance = 0.299 * r + 0.587 * g + 0.114 * b
+                if abs(luminance - 186) < 0.5:
+                    continue
+                expected = "#000000" if luminance > 186 else "#ffffff"
+                assert suitable_text_color(QColor(r, g, b)).name() == expected
+
+
+def test_qcolor_key_matches_rgb_equality():
+    assert qcolor_key(hex_to_qcolor("#123456")) == qcolor_key(QColor(0x12, 0x34, 0x56))
+    assert qcolor_key(hex_to_qcolor("#123456")) != qcolor_key(hex_to_qcolor("#123457"))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import pytest
+
+from cantor_gui.controller import _dust_points, _line_segments
+
+
+def test_cached_geometry_is_read_only():
+    starts, _ = _line_segments(3)
+    with pytest.raises(ValueError):
+        starts[0] = 1.0
+    points = _dust_points(2)
+    with pytest.raises(ValueError):
+        points[0, 0] = 1.0
+    # The cache hands back the same, unmodified arrays
+    assert _line_segments(3)[0] is starts
+    assert starts[0] == 0.0 and points[0, 0] == 0.0
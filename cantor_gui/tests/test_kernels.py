@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+# Only meaningful where the compiled kernels exist
+pytest.importorskip("numba")
+
+from cantor_gui.renderers import _kernels  # noqa: E402
+from cantor_gui.renderers.cantor_line import _THIRD_POW  # noqa: E402
+
+
+def _numpy_numerators(depth):
+    nums = np.empty(1 << depth, dtype=np.uint64)
+    nums[0] = 0
+    n = 1
+    for k in range(depth, 0, -1):
+        np.add(nums[:n], np.uint64(2 * 3 ** (depth - k)), out=nums[n : 2 * n])
+        n *= 2
+    return nums
+
+
+def _numpy_levels(depth):
+    buf = np.empty((2 << depth) - 1)
+    buf[0] = 0.0
+    for d in range(depth):
+        n = 1 << d
+        prev = buf[n - 1 : 2 * n - 1]
+        buf[2 * n - 1 : 4 * n - 1 : 2] = prev
+        buf[2 * n : 4 * n - 1 : 2] = prev + 2.0 * _THIRD_POW[d + 1]
+    return buf
+
+
+def test_compiled_line_numerators_match_numpy():
+    for n in range(0, 16):
+        nums = _kernels.line_numerators(n)
+        assert nums.dtype == np.uint64
+        assert np.array_equal(nums, _numpy_numerators(n))
+
+
+def test_compiled_line_levels_match_numpy():
+    for n in range(0, 12):
+        assert np.array_equal(_kernels.line_levels(n), _numpy_levels(n))
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QColorDialog
+
+from cantor_gui.panels import ControlsPanel
+
+
+def _pick(monkeypatch, panel: ControlsPanel, which: str, color: QColor) -> list:
+    emitted = []
+    getattr(panel, f"{which}ColorChanged").connect(emitted.append)
+    monkeypatch.setattr(QColorDialog, "getColor", lambda *args: QColor(color))
+    getattr(panel, f"_pick_{which}")()
+    return emitted
+
+
+def test_picking_the_same_color_does_not_emit(qapp, monkeypatch):
+    panel = ControlsPanel()
+    assert _pick(monkeypatch, panel, "fg", panel.fg) == []
+    assert _pick(monkeypatch, panel, "bg", panel.bg) == []
+
+
+def test_picking_a_new_color_emits(qapp, monkeypatch):
+    panel = ControlsPanel()
+    emitted = _pick(monkeypatch, panel, "fg", QColor("#ff0000"))
+    assert [c.name() for c in emitted] == ["#ff0000"]
+    assert panel.fg.name() == "#ff0000"
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import string
+from functools import lru_cache
 from typing import Tuple
 
 from PySide6.QtGui import QColor
@@ -8,12 +10,32 @@ from PySide6.QtGui import QColor
 DEFAULT_FG_HEX = "#1b1f23"
 DEFAULT_BG_HEX = "#ffffff"
 
+# Shared results of suitable_text_color; treat as read-only
+_BLACK = QColor(0, 0, 0)
+_WHITE = QColor(255, 255, 255)
+
+_HEX_DIGITS = frozenset(string.hexdigits)
+
 
 def hex_to_qcolor(hex_str: str) -> QColor:
     """Convert a hex color string like '#rrggbb' or 'rrggbb' to QColor.
 
+    Each distinct string is parsed once; callers get their own copy since
+    QColor is mutable.
+
     Raises ValueError if invalid.
     """
+    return QColor(_parse_hex(hex_str))
+
+
+@lru_cache(maxsize=256)
+def _parse_hex(hex_str: str) -> QColor:
+    # Fast path for the usual '#rrggbb'; int() alone would also accept signs,
+    # underscores, a 0x prefix and non-ASCII digits, hence the digit check
+    s = hex_str[1:] if hex_str.startswith("#") else hex_str
+    if len(s) == 6 and _HEX_DIGITS.issuperset(s):
+        v = int(s, 16)
+        return QColor.fromRgb((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
     s = hex_str.strip()
     if not s:
         raise ValueError("Empty color string")
@@ -30,12 +52,22 @@ def qcolor_to_hex(color: QColor) -> str:
     return color.name(QColor.HexRgb)
 
 
+def qcolor_key(color: QColor) -> int:
+    """Return the packed 0xAARRGGBB value of a color for cheap equality tests.
+
+    Alpha is always reported as opaque; use qcolor_to_hex for display.
+    """
+    return color.rgb()
+
+
 def suitable_text_color(bg: QColor) -> QColor:
-    """Return black or white depending on background luminance for contrast."""
+    """Return black or white depending on background luminance for contrast.
+
+    The returned color is shared between calls and must not be modified.
+    """
     r, g, b, _ = bg.getRgb()
-    # Perceived luminance
-    luminance = 0.299 * r + 0.587 * g + 0.114 * b
-    return QColor("black") if luminance > 186 else QColor("white")
+    # Perceived luminance (BT.601 weights in 1/256 units) against 186
+    return _BLACK if 77 * r + 150 * g + 29 * b > 186 * 256 else _WHITE
 
 
 def parse_hex_pair(fg: str | None, bg: str | None) -> Tuple[QColor, QColor]: